@@ -2,6 +2,7 @@
 Define array-handling classes, including agent states
 """
 import numpy as np
+import numba as nb
 import sciris as sc
 import starsim as ss
 
@@ -282,10 +283,14 @@ class Arr(BaseArr):
 
     @property
     def isnan(self):
+        if self.nan is None: # No NaN value defined, so all values are defined; skip the comparison
+            return self.asnew(np.zeros(len(self), dtype=ss_bool), cls=BoolArr)
         return self.asnew(self.values == self.nan, cls=BoolArr)
 
     @property
     def notnan(self):
+        if self.nan is None:
+            return self.asnew(np.ones(len(self), dtype=ss_bool), cls=BoolArr)
         return self.asnew(self.values != self.nan, cls=BoolArr)
 
     def grow(self, new_uids=None, new_vals=None):
@@ -305,12 +310,12 @@ class Arr(BaseArr):
         # Physically reshape the arrays, if needed
         if orig_len + n_new > self.len_tot:
             n_grow = max(n_new, self.len_tot//2)  # Minimum 50% growth, since growing arrays is slow
-            new_empty = np.empty(n_grow, dtype=self.dtype) # 10x faster than np.zeros()
-            self.raw = np.concatenate([self.raw, new_empty], axis=0)
+            new_raw = np.empty(self.len_tot + n_grow, dtype=self.dtype) # 10x faster than np.zeros()
+            new_raw[:self.len_tot] = self.raw # Copy the existing values into the new buffer
+            self.raw = new_raw
             self.len_tot = len(self.raw)
             if n_grow > n_new: # We added extra space at the end, set to NaN
-                nan_uids = np.arange(self.len_used, self.len_tot)
-                self.set_nan(nan_uids)
+                self.raw[self.len_used:] = self.nan # Slice fill, rather than indexing with an array of UIDs
 
         # Set new values, and NaN if needed
         self.set(new_uids, new_vals=new_vals) # Assign new default values to those agents
@@ -347,11 +352,11 @@ class Arr(BaseArr):
 
     def true(self):
         """ Efficiently convert truthy values to UIDs """
-        return self.auids[self.values.astype(bool)]
+        return self.auids[np.flatnonzero(self.values)] # Much faster than indexing with a boolean mask
 
     def false(self):
         """ Reverse of true(); return UIDs of falsy values """
-        return self.auids[~self.values.astype(bool)]
+        return self.auids[np.flatnonzero(np.logical_not(self.values))]
 
     def to_json(self):
         """ Export to JSON """
@@ -379,6 +384,25 @@ class FloatArr(Arr):
         super().__init__(name=name, dtype=ss_float, nan=nan, **kwargs)
         return
 
+    nb_threshold = 5000 # Above this many agents, use the Numba gather, which is ~1.5x faster than NumPy fancy indexing for floats
+
+    @property
+    def values(self):
+        """ Return the values of the active agents """
+        auids = self.auids
+        if len(auids) >= self.nb_threshold:
+            return self._gather(self.raw, auids)
+        return self.raw[auids]
+
+    @staticmethod
+    @nb.njit(fastmath=True, parallel=False, cache=True)
+    def _gather(arr, inds):
+        """ Equivalent to arr[inds] """
+        out = np.empty(len(inds), dtype=arr.dtype)
+        for i in range(len(inds)):
+            out[i] = arr[inds[i]]
+        return out
+
     @property
     def isnan(self):
         """ Return BoolArr for NaN values """
@@ -387,13 +411,17 @@ class FloatArr(Arr):
     @property
     def notnan(self):
         """ Return BoolArr for non-NaN values """
-        return self.asnew(~np.isnan(self.values), cls=BoolArr)
+        mask = np.isnan(self.values)
+        np.logical_not(mask, out=mask) # Invert in place rather than allocating a second array
+        return self.asnew(mask, cls=BoolArr)
 
     @property
     def notnanvals(self):
         """ Return values that are not-NaN """
         vals = self.values # Shorten and avoid double indexing
-        out = vals[np.nonzero(~np.isnan(vals))[0]]
+        mask = np.isnan(vals)
+        np.logical_not(mask, out=mask)
+        out = vals[np.flatnonzero(mask)]
         return out
 
 
@@ -408,14 +436,14 @@ class BoolArr(Arr):
     def __xor__(self, other): return self.asnew(self.values ^ other)
     def __invert__(self):     return self.asnew(~self.values)
 
-    # BoolArr cannot store NaNs so report all entries as being not-NaN
+    # BoolArr cannot store NaNs so report all entries as being not-NaN; no need to gather self.values just to get the shape
     @property
     def isnan(self):
-        return self.asnew(np.full_like(self.values, fill_value=False), cls=BoolArr)
+        return self.asnew(np.zeros(len(self), dtype=ss_bool), cls=BoolArr)
 
     @property
     def notnan(self):
-        return self.asnew(np.full_like(self.values, fill_value=True), cls=BoolArr)
+        return self.asnew(np.ones(len(self), dtype=ss_bool), cls=BoolArr)
 
     @property
     def uids(self):
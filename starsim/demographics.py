@@ -209,16 +209,19 @@ class Deaths(Demographics):
 
             death_rate = np.empty(uids.shape, dtype=ss_float_)
 
+            age = ppl.age.values # Gather the ages and sexes once, rather than once per sex
             if 'sex' in drd.index.names:
+                female = ppl.female.values
+                male = ~female
                 s = drd.loc[nearest_year, 'f']
-                binned_ages = np.digitize(ppl.age[ppl.female], s.index)-1 # Negative ages will be in the first bin - do *not* subtract 1 so that this bin is 0
-                death_rate[ppl.female] = s.values[binned_ages]
+                binned_ages = np.searchsorted(s.index.values, age[female], side='right')-1 # Equivalent to np.digitize() for sorted bins, but faster. Negative ages will be in the first bin - do *not* subtract 1 so that this bin is 0
+                death_rate[female] = s.values[binned_ages]
                 s = drd.loc[nearest_year, 'm']
-                binned_ages = np.digitize(ppl.age[ppl.male], s.index)-1 # Negative ages will be in the first bin - do *not* subtract 1 so that this bin is 0
-                death_rate[ppl.male] = s.values[binned_ages]
+                binned_ages = np.searchsorted(s.index.values, age[male], side='right')-1 # Negative ages will be in the first bin - do *not* subtract 1 so that this bin is 0
+                death_rate[male] = s.values[binned_ages]
             else:
                 s = drd.loc[nearest_year]
-                binned_ages = np.digitize(ppl.age, s.index)-1 # Negative ages will be in the first bin - do *not* subtract 1 so that this bin is 0
+                binned_ages = np.searchsorted(s.index.values, age, side='right')-1 # Equivalent to np.digitize() for sorted bins, but faster. Negative ages will be in the first bin - do *not* subtract 1 so that this bin is 0
                 death_rate[:] = s.values[binned_ages]
 
         # Scale from rate to probability. Consider an exponential here.
@@ -331,7 +334,7 @@ class Pregnancy(Demographics):
 
             # Assign agents to age bins
             age_bins = self.fertility_rate_data.columns.values
-            age_bin_all = np.digitize(age, age_bins) - 1
+            age_bin_all = np.searchsorted(age_bins, age, side='right') - 1 # Equivalent to np.digitize() since the bins are sorted
             new_rate = self.fertility_rate_data.loc[nearest_year].values.copy()  # Initialize array with new rates
 
             if (~self.fecund).any():
@@ -340,7 +343,7 @@ class Pregnancy(Demographics):
                 age_counts = np.zeros(len(age_bins))
                 age_counts[v] = c
 
-                age_bin_infecund = np.digitize(sim.people.age[~self.fecund], age_bins) - 1
+                age_bin_infecund = np.searchsorted(age_bins, sim.people.age[~self.fecund], side='right') - 1
                 v, c = np.unique(age_bin_infecund, return_counts=True)
                 infecund_age_counts = np.zeros(len(age_bins))
                 infecund_age_counts[v] = c
@@ -347,7 +347,8 @@ class Infection(Disease):
         ti = self.ti
         res.prevalence[ti] = res.n_infected[ti] / np.count_nonzero(self.sim.people.alive)
         res.new_infections[ti] = np.count_nonzero(self.ti_infected == ti)
-        res.cum_infections[ti] = np.sum(res['new_infections'][:ti+1]) # TODO: can compute at end
+        prev_cum = res.cum_infections[ti-1] if ti else 0
+        res.cum_infections[ti] = prev_cum + res.new_infections[ti] # Running total, equivalent to np.sum(res.new_infections[:ti+1])
         return
 
 
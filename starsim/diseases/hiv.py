@@ -118,7 +118,7 @@ class ART(ss.Intervention):
 
         hiv = sim.people.hiv
         infected = hiv.infected.uids
-        ti_delay = np.round(self.pars.art_delay.rvs(infected)).astype(int)
+        ti_delay = np.rint(self.pars.art_delay.rvs(infected)).astype(int) # np.rint() is the ufunc behind np.round(), without the wrapper
         recently_infected = infected[hiv.ti_infected[infected] == sim.ti-ti_delay]
 
         n_added = 0
@@ -255,7 +255,7 @@ class Syphilis(ss.Infection):
         # Determine outcomes
         for state in ['active', 'latent']:
 
-            source_state_inds = getattr(self, state)[sources].nonzero()[0]
+            source_state_inds = np.flatnonzero(getattr(self, state)[sources])
             state_uids = uids[source_state_inds]
 
             if len(state_uids) > 0:
@@ -10,6 +10,12 @@ import matplotlib.pyplot as plt
 
 __all__ = ['link_dists', 'make_dist', 'dist_list', 'Dists', 'Dist']
 
+# Parameter types that never need to be called, rescaled, or treated as dynamic; checked by exact type in Dist.call_pars()
+plain_par_types = {int, float, bool, np.float64, np.float32, np.int64, np.int32, np.bool_}
+
+# The amount PCG64.jumped() advances the state for each jump, i.e. (φ-1)*2**128 rounded to an odd integer
+pcg64_jump_step = 0x9e3779b97f4a7c15f39cc0605cedc835
+
 
 def str2int(string, modulo=1_000_000_000):
     """
@@ -123,12 +129,14 @@ class Dists(sc.prettyobj):
             out += dist.jump(to=to, delta=delta, force=force)
         return out
 
-    def jump_dt(self, ti=None, force=False): # Could this be simplified with jump(), or nice to have the parallel with Dist?
+    def jump_dt(self, ti=None, force=False, lazy=False): # Could this be simplified with jump(), or nice to have the parallel with Dist?
         """
         Advance all RNGs to the next timestep
 
         Args:
             ti (int): if specified, jump to this timestep (default: current sim timestep)
+            force (bool): whether to allow jumping to a state that has already been used
+            lazy (bool): whether to defer each jump until that RNG is next used, in which case no states are returned
         """
         out = sc.autolist()
 
@@ -137,7 +145,9 @@ class Dists(sc.prettyobj):
             return out
 
         for dist in self.dists.values():
-            out += dist.jump_dt(ti=ti, force=force)
+            state = dist.jump_dt(ti=ti, force=force, lazy=lazy)
+            if not lazy:
+                out += state
         return out
 
     def reset(self):
@@ -222,11 +232,11 @@ class Dist:
 
         # History and random state
         self.dt_jump_size = 1000 # How much to advance the RNG for each timestep (must be larger than the number times dist is called per timestep)
-        self.rng = None # The actual RNG generator for generating random numbers
+        self.rng = None # The actual RNG generator for generating random numbers; see also _jump_to
         self.trace = None # The path of this object within the parent
         self.ind = 0 # The index of the RNG (usually updated on each timestep)
         self.called = 0 # The number of times the distribution has been called
-        self.history = [] # Previous states
+        self.history = [] # Previous states: the initial state, and the state before the most recent call
         self.ready = True
         self.initialized = False
         if not strict: # Otherwise, wait for a sim
@@ -278,6 +288,27 @@ class Dist:
             self.process_pars(call=False)
         return
 
+    def __setstate__(self, state):
+        """ Restore from a pickle, including ones saved before the RNG was stored as _rng """
+        if 'rng' in state: # The RNG used to be a plain attribute, which would now be shadowed by the property
+            state['_rng'] = state.pop('rng')
+        state.setdefault('_jump_to', None)
+        self.__dict__.update(state)
+        return
+
+    @property
+    def rng(self):
+        """ The random number generator, after carrying out any deferred jump (see jump()) """
+        if self._jump_to is not None:
+            self._apply_jump()
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng):
+        self._rng = rng
+        self._jump_to = None # A new RNG starts from its own state, so there is nothing left to jump
+        return
+
     @property
     def bitgen(self):
         try:    return self.rng._bit_generator
@@ -297,13 +328,20 @@ class Dist:
 
     def get_state(self):
         """ Return a copy of the state """
-        return self.state.copy()
+        return self.state # The bit generator creates a new dict each time, so no need to copy it
 
     def make_history(self, reset=False):
-        """ Store the current state in history """
-        if reset:
-            self.history = []
-        self.history.append(self.get_state()) # Store the initial state
+        """
+        Store the current state in history
+
+        Only the initial state and the most recent state are kept (which are all
+        that reset() needs), so the history doesn't grow with every call.
+        """
+        state = self.get_state()
+        if reset or not self.history:
+            self.history = [state] # Store the initial state
+        else:
+            self.history[1:] = [state] # Replace the previous most recent state
         return
 
     def reset(self, state=0):
@@ -327,12 +365,20 @@ class Dist:
         """
         if not isinstance(state, dict):
             state = self.history[state]
-        self.rng._bit_generator.state = state.copy()
+        self._jump_to = None # Restoring a state supersedes any deferred jump
+        self._rng._bit_generator.state = state # Setting the state copies the values, so the stored state is unchanged
         self.ready = True
         return self.state
 
-    def jump(self, to=None, delta=1, force=False):
-        """ Advance the RNG, e.g. to timestep "to", by jumping """
+    def jump(self, to=None, delta=1, force=False, lazy=False):
+        """
+        Advance the RNG, e.g. to timestep "to", by jumping
+
+        Since the state after a jump depends only on the initial state and the number of jumps,
+        with lazy=True the jump is just recorded, and carried out the next time the RNG is used.
+        This means that e.g. the jump after each draw is free for distributions that are only
+        called once per timestep. Note that with lazy=True, nothing is returned.
+        """
 
         # Do not jump if centralized # TODO: remove
         if ss.options._centralized:
@@ -346,24 +392,39 @@ class Dist:
                         'random numbers twice. If you are sure you want to do this, set force=True.'
             raise DistSeedRepeatError(msg=errormsg)
 
-        # Do the jumping
+        # Record the jump, and carry it out unless it's deferred until the RNG is next used
         self.ind = jumps
-        self.reset() # First reset back to the initial state (used in case of different numbers of calls)
+        self._jump_to = jumps
+        self.ready = True
+        if lazy:
+            return
+        return self.state # Accessing the state performs the jump
+
+    def _apply_jump(self):
+        """ Carry out the most recently requested jump; not for the user """
+        jumps = self._jump_to
+        self.reset() # First reset back to the initial state (used in case of different numbers of calls); also clears _jump_to
         if jumps: # Seems to randomize state if jumps=0
-            self.bitgen.state = self.bitgen.jumped(jumps=jumps).state # Now take "jumps" number of jumps
-        return self.state
+            bitgen = self._rng._bit_generator
+            if type(bitgen) is np.random.PCG64: # Same result as jumped(), but in place, rather than creating a new bit generator and copying its state back
+                bitgen.advance(pcg64_jump_step*jumps)
+            else:
+                bitgen.state = bitgen.jumped(jumps=jumps).state # Now take "jumps" number of jumps
+        return
 
-    def jump_dt(self, ti=None, force=False):
+    def jump_dt(self, ti=None, force=False, lazy=False):
         """
         Automatically jump on the next value of dt
 
         Args:
             ti (int): if specified, jump to this timestep (default: current module timestep plus one)
+            force (bool): whether to allow jumping to a state that has already been used
+            lazy (bool): whether to defer the jump until the RNG is next used (see jump())
         """
         if ti is None:
             ti = self.module.t.ti + 1
         to = self.dt_jump_size*ti
-        return self.jump(to=to, force=force)
+        return self.jump(to=to, force=force, lazy=lazy)
 
     def init(self, trace=None, seed=None, module=None, sim=None, slots=None, force=False):
         """ Calculate the starting seed and create the RNG """
@@ -462,12 +523,13 @@ class Dist:
 
     def process_size(self, n=1):
         """ Handle an input of either size or UIDs and calculate size, UIDs, and slots; not for the user """
-        if np.isscalar(n) or isinstance(n, tuple):  # If passing a non-scalar size, interpret as dimension rather than UIDs iff a tuple
+        is_uids = isinstance(n, ss.uids) # Check this first, since it's the usual case, and much faster than np.isscalar()
+        if not is_uids and (np.isscalar(n) or isinstance(n, tuple)):  # If passing a non-scalar size, interpret as dimension rather than UIDs iff a tuple
             uids = None
             slots = None
             size = n
         else:
-            uids = ss.uids(n)
+            uids = n if is_uids else ss.uids(n) # Don't copy if these are already UIDs
             if len(uids):
                 if self.slots is None:
                     errormsg = f'Could not find any slots in {self}. Did you remember to initialize the distribution with the sim?'
@@ -490,7 +552,7 @@ class Dist:
     def process_pars(self, call=True):
         """ Ensure the supplied dist and parameters are valid, and initialize them; not for the user """
         self._timepar = None # Time rescalings need to be done after distributions are calculated; store the correction factor here
-        self._pars = sc.cp(self.pars) # The actual keywords; shallow copy, modified below for special cases
+        self._pars = sc.objdict(self.pars) # The actual keywords; shallow copy, modified below for special cases (about twice as fast as sc.cp())
         if call:
             self.call_pars() # Convert from function to values if needed
         spars = self.sync_pars() # Synchronize parameters between the NumPy and SciPy distributions
@@ -499,7 +561,7 @@ class Dist:
     def preprocess_timepar(self, key, timepar):
         """ Method to handle how timepars are processed; not for the user. By default, scales the output of the distribution. """
         if self._timepar is None: # Store this here for later use
-            self._timepar = sc.dcp(timepar) # Make a copy to avoid modifying the original
+            self._timepar = sc.cp(timepar) # Make a (shallow) copy to avoid modifying the original
         elif timepar.factor != self._timepar.factor:
             errormsg = f'Cannot have time parameters in the same distribution with inconsistent unit/dt values: {self._pars}'
             raise ValueError(errormsg)
@@ -532,6 +594,8 @@ class Dist:
 
         # Check each parameter
         for key,val in self._pars.items():
+            if type(val) in plain_par_types: # Skip the checks below for the most common case
+                continue
             val = self.call_par(key, val, size, uids)
 
             # If it's iterable and UIDs are provided, then we need to use array-parameter logic
@@ -578,9 +642,7 @@ class Dist:
         self._timepar = None # Remove the timepar which is no longer needed
         timepar.v = rvs # Replace the base value with the random variates
         timepar.update_cached() # Recalculate the factor and values with the time scaling
-        rvs = timepar.values # Replace the rvs with the scaled version
-        if isinstance(rvs, np.ndarray): # This can be false when converting values for a Bernoulli distribution (in which case rvs are actually dist parameters)
-            rvs = rvs.astype(rvs.dtype) # Replace the random variates with the scaled version, and preserve type
+        rvs = timepar.values # Replace the rvs with the scaled version; this is always a new array (or a scalar for Bernoulli parameters), so no need to copy it again
         return rvs
 
     def rvs(self, n=1, reset=False):
@@ -631,7 +693,7 @@ class Dist:
         if reset:
             self.reset(-1)
         elif self.auto: # TODO: check
-            self.jump()
+            self.jump(lazy=True)
         elif self.strict:
             self.ready = False
         if self.debug:
@@ -727,12 +789,22 @@ class uniform(Dist):
     def make_rvs(self):
         """ Specified here because uniform() doesn't take a dtype argument """
         p = self._pars
-        rvs = self.rand(self._size) * (p.high - p.low) + p.low
+        rvs = self.rand(self._size)
+        width = p.high - p.low
+        if np.result_type(rvs, width, p.low) == rvs.dtype: # Reuse the buffer, unless the parameters would upcast the result
+            rvs *= width
+            rvs += p.low
+        else:
+            rvs = rvs * width + p.low
         return rvs
 
     def ppf(self, rands):
         p = self._pars
-        rvs = rands * (p.high - p.low) + p.low
+        rvs = rands * (p.high - p.low) # New array, so the input is left unchanged
+        if np.result_type(rvs, p.low) == rvs.dtype: # Shift in place, unless that would downcast the result
+            rvs += p.low
+        else:
+            rvs = rvs + p.low
         return rvs
 
 
@@ -743,12 +815,38 @@ class normal(Dist):
     Args:
         loc (float): the mean of the distribution (default 0.0)
         scale (float) the standard deviation of the distribution (default 1.0)
+        dtype (dtype): the float type of the random variates; use np.float32 (ss.dtypes.float) for faster draws if full precision isn't needed (default np.float64)
 
     """
-    def __init__(self, loc=0.0, scale=1.0, **kwargs): # Does not accept dtype
+    dtype = np.float64 # Class default, so older pickles without a dtype still load
+
+    def __init__(self, loc=0.0, scale=1.0, dtype=np.float64, **kwargs):
+        self.dtype = dtype # Not a parameter of the distribution, so don't pass it to NumPy/SciPy
         super().__init__(distname='normal', dist=sps.norm, loc=loc, scale=scale, **kwargs)
         return
 
+    def make_rvs(self):
+        """ Scale and shift standard normals in place; same values as rng.normal(), but faster for array parameters """
+        p = self._pars
+        scale = np.asarray(p.scale) # In case it's a list
+        if np.any(scale < 0): # rng.normal() checks this, but standard_normal() can't
+            errormsg = f'The scale of a normal distribution cannot be negative ({self})'
+            raise ValueError(errormsg)
+        if scale.ndim == 0 and scale == 0: # Degenerate case, so skip generating random numbers (as for ss.constant()); array scales use the general path below
+            return np.full(self._size, p.loc, dtype=self.dtype)
+        rvs = self.rng.standard_normal(self._size, dtype=self.dtype)
+        rvs *= p.scale
+        rvs += p.loc
+        return rvs
+
+    def ppf(self, rands):
+        p = self._pars
+        scale = np.asarray(p.scale)
+        if scale.ndim == 0 and scale == 0: # SciPy would return NaN here
+            return np.full(rands.shape, p.loc, dtype=self.dtype)
+        rvs = self.dist.ppf(rands)
+        return rvs.astype(self.dtype, copy=False)
+
 
 class lognorm_im(Dist):
     """
@@ -766,6 +864,8 @@ class lognorm_im(Dist):
 
         ss.lognorm_im(mean=2, sigma=1, strict=False).rvs(1000).mean() # Should be roughly 10
     """
+    _scale_cache = None # The most recent SciPy scale for a scalar mean, since this rarely changes; a class default so older pickles without it still load
+
     def __init__(self, mean=0.0, sigma=1.0, **kwargs): # Does not accept dtype
         super().__init__(distname='lognormal', dist=sps.lognorm, mean=mean, sigma=sigma, **kwargs)
         return
@@ -775,10 +875,14 @@ class lognorm_im(Dist):
         if call:
             self.call_pars()
         p = self._pars
-        spars = sc.dictobj()
-        spars.s = p.sigma
-        spars.scale = np.exp(p.mean)
-        spars.loc = 0
+        mean = p['mean'] # Item access is faster than attribute access for objdicts
+        if np.isscalar(mean):
+            if self._scale_cache is None or self._scale_cache[0] != mean:
+                self._scale_cache = (mean, np.exp(mean))
+            scale = self._scale_cache[1]
+        else:
+            scale = np.exp(mean)
+        spars = dict(s=p['sigma'], scale=scale, loc=0) # Plain dict, since this is only passed to SciPy
         self.update_dist_pars(spars)
         return spars
 
@@ -803,6 +907,9 @@ class lognorm_ex(Dist):
 
         ss.lognorm_ex(mean=2, std=1, strict=False).rvs(1000).mean() # Should be close to 2
     """
+    _im_cache = None # The most recent conversion of scalar parameters, since these rarely change; a class default so older pickles without it still load
+    _scale_cache = None # Used by lognorm_im.sync_pars()
+
     def __init__(self, mean=1.0, std=1.0, **kwargs): # Does not accept dtype
         super().__init__(distname='lognormal', dist=sps.lognorm, mean=mean, std=std, **kwargs)
         return
@@ -822,12 +929,18 @@ class lognorm_ex(Dist):
         if np.isscalar(mean) and mean <= 0:
             errormsg = f'Cannot create a lognorm_ex distribution with mean≤0 (mean={mean}); did you mean to use lognorm_im instead?'
             raise ValueError(errormsg)
-        std2 = std**2
-        mean2 = mean**2
-        sigma_im = np.sqrt(np.log(std2/mean2 + 1)) # Computes std for the underlying normal distribution
-        mean_im  = np.log(mean2 / np.sqrt(std2 + mean2)) # Computes the mean of the underlying normal distribution
-        p.mean = mean_im
-        p.sigma = sigma_im
+        key = (mean, std) if np.isscalar(mean) and np.isscalar(std) else None
+        if key is not None and self._im_cache is not None and self._im_cache[0] == key:
+            mean_im, sigma_im = self._im_cache[1]
+        else:
+            std2 = std**2
+            mean2 = mean**2
+            sigma_im = np.sqrt(np.log(std2/mean2 + 1)) # Computes std for the underlying normal distribution
+            mean_im  = np.log(mean2 / np.sqrt(std2 + mean2)) # Computes the mean of the underlying normal distribution
+            if key is not None:
+                self._im_cache = (key, (mean_im, sigma_im))
+        p['mean'] = mean_im
+        p['sigma'] = sigma_im
         return mean_im, sigma_im
 
     def sync_pars(self):
@@ -912,8 +1025,12 @@ class randint(Dist):
 
     def ppf(self, rands):
         p = self._pars
-        rvs = rands * (p.high + 1 - p.low) + p.low
-        rvs = rvs.astype(self.dtype)
+        rvs = rands * (p.high + 1 - p.low) # New array, so the input is left unchanged
+        if np.result_type(rvs, p.low) == rvs.dtype: # Shift in place, unless that would downcast the result
+            rvs += p.low
+        else:
+            rvs = rvs + p.low
+        rvs = rvs.astype(p.dtype)
         return rvs
 
     def preprocess_timepar(self, key, timepar):
@@ -970,8 +1087,11 @@ class gamma(Dist):
         return
 
     def make_rvs(self):
-        """ Use SciPy rather than NumPy to include the scale parameter """
-        rvs = self.dist.rvs(self._size)
+        """ Apply the scale and location in place; gives the same numbers as SciPy, but skips its per-call overhead """
+        p = self._pars
+        rvs = self.rng.standard_gamma(p.a, self._size)
+        rvs *= p.scale
+        rvs += p.loc
         return rvs
 
 
@@ -1015,6 +1135,13 @@ class bernoulli(Dist):
         rvs = rands < self._pars.p
         return rvs
 
+    def call_pars(self):
+        """ As usual, but with UIDs always take the random values for the slots before comparing, rather than comparing every value drawn """
+        super().call_pars()
+        if self._uids is not None and self.dynamic_pars is None:
+            self.dynamic_pars = True # The random numbers drawn are identical either way; this only changes how many get compared with p
+        return
+
     def filter(self, uids=None, both=False):
         """ Return UIDs that correspond to True, or optionally return both True and False """
         if uids is None:
@@ -1037,7 +1164,7 @@ class bernoulli(Dist):
         is_timepar = isinstance(val, ss.TimePar)
 
         if is_timepar: # If it's a time parameter, pull out the value
-            timepar = sc.dcp(val) # Rename to make more sense within the context of this method
+            timepar = sc.cp(val) # Rename to make more sense within the context of this method; a shallow copy is enough since postprocess_timepar() only rebinds attributes
             val = timepar.v # Pull out the base value; we'll deal with the transformation later
             self._timepar = timepar # This is used, then destroyed, by postprocess_timepar() below
             if isinstance(timepar, ss.dur): # Validation
@@ -1076,11 +1203,36 @@ class choice(Dist):
     Note: although Bernoulli trials can be generated using a=2, it is much faster
     to use ss.bernoulli() instead.
     """
+    _cdf = None # Built from p the first time it's needed, and then reused; a class default so older pickles without it still load
+
     def __init__(self, a=2, p=None, **kwargs):
         super().__init__(distname='choice', a=a, p=p, **kwargs)
         self.dynamic_pars = False # Set to false since array arguments don't imply dynamic pars here
         return
 
+    def get_cdf(self, a, p):
+        """ Return the normalized CDF of the probabilities, only recalculating if they've changed; not for the user """
+        parr = np.asarray(p, dtype=np.float64)
+        n = a if np.isscalar(a) else len(a)
+        if self._cdf is None or self._cdf[0] != n or not np.array_equal(self._cdf[1], parr): # Compare values, since p may have been modified in place
+            if parr.shape != (n,) or (parr < 0).any() or abs(parr.sum() - 1) > np.sqrt(np.finfo(np.float64).eps):
+                errormsg = f'Probabilities for {self} must be non-negative, sum to 1, and match the number of choices ({n}), not {p}'
+                raise ValueError(errormsg)
+            cdf = parr.cumsum()
+            cdf /= cdf[-1]
+            self._cdf = (n, parr.copy(), cdf) # Copy, so later in-place changes to p are detected
+        return self._cdf[2]
+
+    def make_rvs(self):
+        """ Equivalent to rng.choice(a, p=p), but without rebuilding the CDF on every call """
+        pars = self._pars
+        if pars.p is None or not pars.get('replace', True): # Sampling without replacement isn't a simple CDF lookup, so leave it to NumPy
+            return super().make_rvs()
+        cdf = self.get_cdf(pars.a, pars.p)
+        inds = cdf.searchsorted(self.rng.random(self._size), side='right')
+        rvs = inds if np.isscalar(pars.a) else np.asarray(pars.a)[inds]
+        return rvs
+
     def ppf(self, rands):
         """ Shouldn't actually be needed since dynamic pars not supported """
         pars = self._pars
@@ -1132,6 +1284,9 @@ class histogram(Dist):
         h2 = ss.histogram(data=data, strict=False)
         h2.plot_hist(bins=100)
     """
+    _cdf = None # Set in __init__(); class defaults so older pickles without them fall back to SciPy
+    _bins = None
+
     def __init__(self, values=None, bins=None, density=False, data=None, **kwargs):
         if data is not None:
             if values is not None:
@@ -1155,8 +1310,26 @@ class histogram(Dist):
         dist = sps.rv_histogram((values, bins), density=density) # Create the SciPy distribution
         super().__init__(dist=dist, distname='histogram', **kwargs)
         self.dynamic_pars = False # Set to false since array arguments don't imply dynamic pars here
+
+        # The normalized CDF and bin edges are fixed, so store them for sampling directly (same calculation as SciPy)
+        widths = np.diff(bins)
+        pdf = values if density else values / widths
+        pdf = pdf / float(np.sum(pdf * widths))
+        self._cdf = np.concatenate([[0.0], np.cumsum(pdf * widths)])
+        self._bins = np.asarray(bins)
         return
 
+    def make_rvs(self):
+        """ Invert the CDF directly, skipping SciPy's per-call argument processing (same numbers as dist.rvs()) """
+        rands = self.rng.uniform(size=self._size)
+        return self.ppf(rands)
+
+    def ppf(self, rands):
+        """ Percent point function, calculated from the stored CDF """
+        if self._cdf is None:
+            return self.dist.ppf(rands)
+        return np.interp(rands, self._cdf, self._bins)
+
 
 class multi_random(sc.prettyobj):
     """
@@ -377,7 +377,7 @@ class treat_num(BaseTreatment):
     """
     def __init__(self, max_capacity=None, **kwargs):
         super().__init__(**kwargs)
-        self.queue = []
+        self.queue = ss.uids() # Kept as an array, in order of arrival, rather than a list of Python ints
         self.max_capacity = max_capacity
         return
 
@@ -386,20 +386,15 @@ class treat_num(BaseTreatment):
         Add people who are willing to accept treatment to the queue
         """
         accept_inds = self.get_accept_inds()
-        if len(accept_inds): self.queue += accept_inds.tolist()
+        if len(accept_inds): self.queue = self.queue.concat(accept_inds)
         return
 
     def get_candidates(self):
         """
         Get the indices of people who are candidates for treatment
         """
-        treat_candidates = np.array([], dtype=int)
-        if len(self.queue):
-            if self.max_capacity is None or (self.max_capacity > len(self.queue)):
-                treat_candidates = self.queue[:]
-            else:
-                treat_candidates = self.queue[:self.max_capacity]
-        return ss.uids(treat_candidates) # TODO: Check
+        treat_candidates = self.queue[:self.max_capacity] # Slicing with None returns the whole queue
+        return treat_candidates
 
     def step(self):
         """
@@ -408,7 +403,7 @@ class treat_num(BaseTreatment):
         """
         self.add_to_queue()
         treat_inds = BaseTreatment.step(self) # Apply method from BaseTreatment class
-        self.queue = [e for e in self.queue if e not in treat_inds] # Recreate the queue, removing people who were treated
+        self.queue = self.queue[~np.isin(self.queue, treat_inds)] # Remove people who were treated, keeping the rest in order
         return treat_inds
 
 
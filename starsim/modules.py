@@ -106,6 +106,14 @@ class Module(Base):
         kwargs (dict): passed to ss.Time() (e.g. start, stop, unit, dt)
     """
 
+    _registry = {} # All Module subclasses by lowercase class name, in order of definition (since e.g. a user class can reuse a built-in name); populated by __init_subclass__()
+
+    def __init_subclass__(cls, **kwargs):
+        """ Register each subclass by name, so it can be looked up without scanning the class hierarchy """
+        super().__init_subclass__(**kwargs)
+        Module._registry.setdefault(cls.__name__.lower(), []).append(cls)
+        return
+
     def __init__(self, name=None, label=None, **kwargs):
         # Handle parameters
         self.pars = ss.Pars() # Usually populated via self.define_pars()
@@ -240,7 +248,7 @@ class Module(Base):
     def start_step(self):
         """ Tasks to perform at the beginning of the step """
         if self.dists is not None: # Will be None if no distributions are defined
-            self.dists.jump_dt() # Advance random number generators forward for calls on this step
+            self.dists.jump_dt(lazy=True) # Advance random number generators forward for calls on this step; each jump is only done if that RNG is used
         return
 
     def step(self):
@@ -341,11 +349,10 @@ class Module(Base):
         Args:
             name (str): A string with the name of the module class in lower case, e.g. 'sir'
         """
-        for subcls in ss.all_subclasses(cls):
-            if subcls.__name__.lower() == name:
+        for subcls in Module._registry.get(name, []): # The first-defined match wins, so user classes don't replace built-in ones of the same name
+            if issubclass(subcls, cls):
                 return subcls(*args, **kwargs)
-        else:
-            raise KeyError(f'Module "{name}" did not match any known Starsim modules')
+        raise KeyError(f'Module "{name}" did not match any known Starsim modules')
 
     @classmethod
     def from_func(cls, func):
@@ -1,13 +1,12 @@
 """
 Networks that connect people within a population
 """
+import itertools
 import networkx as nx
 import numpy as np
 import numba as nb
 import sciris as sc
 import starsim as ss
-import scipy.optimize as spo
-import scipy.spatial as spsp
 
 # This has a significant impact on runtime, surprisingly
 ss_float_ = ss.dtypes.float
@@ -64,6 +63,9 @@ class Network(Route):
         network2 = ss.Network(**network, index=index, self_conn=self_conn, label=network.label)
     """
 
+    _triu_cache = None # All-pairs indices, used by networks that consider every pair of agents; see triu_pairs()
+    triu_cache_limit = 1_000_000 # Maximum number of pairs to store (16 MB with int64 indices)
+
     def __init__(self, key_dict=None, prenatal=False, postnatal=False, name=None, label=None, **kwargs):
         # Initialize as a module
         super().__init__(name=name, label=label)
@@ -78,14 +80,19 @@ class Network(Route):
         self.prenatal = prenatal  # Prenatal connections are added at the time of conception. Requires ss.Pregnancy()
         self.postnatal = postnatal  # Postnatal connections are added at the time of delivery. Requires ss.Pregnancy()
 
-        # Initialize the keys of the network
+        # Initialize the keys of the network, using the data if provided rather than creating an empty array only to replace it
         self.edges = sc.objdict()
         for key, dtype in self.meta.items():
-            self.edges[key] = np.empty((0,), dtype=dtype)
+            if key in kwargs:
+                self.edges[key] = np.array(kwargs[key], dtype=dtype)
+            else:
+                self.edges[key] = np.empty((0,), dtype=dtype)
 
-        # Set data, if provided
+        # Set any additional data
         for key, value in kwargs.items():
-            self.edges[key] = np.array(value, dtype=self.meta.get(key)) # Overwrite dtype if supplied, else keep original
+            if key not in self.meta:
+                self.edges[key] = np.array(value) # Keep original dtype
+        if len(kwargs):
             self.initialized = True
 
         # Define states using placeholder values
@@ -152,7 +159,14 @@ class Network(Route):
     @property
     def members(self):
         """ Return sorted array of all members """
-        return np.unique([self.edges.p1, self.edges.p2]).view(ss.uids)
+        p1 = self.edges.p1
+        p2 = self.edges.p2
+        if not len(p1):
+            return ss.uids()
+        is_member = np.zeros(max(p1.max(), p2.max()) + 1, dtype=bool) # A boolean mask over UIDs is linear, unlike the sort required by np.unique()
+        is_member[p1] = True
+        is_member[p2] = True
+        return np.flatnonzero(is_member).view(ss.uids)
 
     def meta_keys(self):
         """ Return the keys for the network's meta information """
@@ -174,7 +188,10 @@ class Network(Route):
             if key in edges:
                 arr = edges[key]
                 if not isinstance(arr, ss.uids):
-                    self.edges[key] = ss.uids(arr)
+                    if isinstance(arr, np.ndarray) and arr.dtype == ss_int_:
+                        self.edges[key] = arr.view(ss.uids) # Avoid copying, e.g. after np.concatenate() in append()
+                    else:
+                        self.edges[key] = ss.uids(arr)
         return
 
     def validate(self, force=True):
@@ -318,10 +335,11 @@ class Network(Route):
             inds = np.array(inds, dtype=np.int64)
 
         # Find the edges
-        contact_inds = ss.find_contacts(self.edges.p1, self.edges.p2, inds)
-        if as_array:
-            contact_inds = np.fromiter(contact_inds, dtype=ss_int_)
+        if as_array: # Use the array from the compiled scan directly, rather than converting it to a set and back
+            contact_inds = ss.utils.find_contacts_numba(self.edges.p1, self.edges.p2, inds)
             contact_inds.sort()
+        else:
+            contact_inds = ss.find_contacts(self.edges.p1, self.edges.p2, inds)
 
         return contact_inds
 
@@ -336,9 +354,53 @@ class Network(Route):
         is specifically used when removing agents from the simulation.
         """
         keep = ~(np.isin(self.edges.p1, uids) | np.isin(self.edges.p2, uids))
+        self.keep_edges(keep)
+        return
+
+    def keep_edges(self, keep):
+        """
+        Keep only the edges where the boolean array ``keep`` is true, applying the same
+        mask to every column of the edgelist. If every edge is kept, the columns are left
+        as they are rather than copied.
+        """
+        if keep.all():
+            return
         for k in self.meta_keys():
             self.edges[k] = self.edges[k][keep]
+        return
+
+    def triu_pairs(self, n):
+        """
+        Return all pairs i < j of n agents
 
+        The arrays only depend on n, so the most recent ones are stored on the network
+        (and are therefore read-only) and reused while n is unchanged. This trades
+        memory for speed: the arrays hold n*(n-1)/2 pairs each, so they are only stored
+        if there are at most ``triu_cache_limit`` pairs, and they are never copied or
+        saved with the network, and are removed when it is finalized.
+        """
+        cache = self._triu_cache
+        if cache is not None and cache[0] == n:
+            return cache[1], cache[2]
+        p1, p2 = np.triu_indices(n=n, k=1)
+        if len(p1) <= self.triu_cache_limit:
+            p1.setflags(write=False)
+            p2.setflags(write=False)
+            self._triu_cache = (n, p1, p2)
+        else:
+            self._triu_cache = None
+        return p1, p2
+
+    def __getstate__(self):
+        """ Do not copy or save the stored all-pairs indices; see triu_pairs() """
+        state = self.__dict__.copy()
+        state['_triu_cache'] = None
+        return state
+
+    def finalize(self):
+        """ Remove the stored all-pairs indices, since they can be large """
+        super().finalize()
+        self._triu_cache = None
         return
 
     def net_beta(self, disease_beta=None, inds=None, disease=None):
@@ -361,12 +423,11 @@ class DynamicNetwork(Network):
 
     def end_pairs(self):
         people = self.sim.people
-        self.edges.dur = self.edges.dur - self.t.dt # TODO: think about whether this is right # Update: it is, if duration is *NOT* a ss.dur! Otherwise it should be -1, in timestep units
+        self.edges.dur -= self.t.dt # In place, to avoid allocating a new array each step # TODO: think about whether this is right # Update: it is, if duration is *NOT* a ss.dur! Otherwise it should be -1, in timestep units
 
         # Non-alive agents are removed
         active = (self.edges.dur > 0) & people.alive[self.edges.p1] & people.alive[self.edges.p2]
-        for k in self.meta_keys():
-            self.edges[k] = self.edges[k][active]
+        self.keep_edges(active)
         return len(active)
 
 
@@ -379,25 +440,36 @@ class SexualNetwork(DynamicNetwork):
         return
 
     def active(self, people):
-        # Exclude people who are not alive
-        valid_age = people.age > self.debut
-        active = self.participant & valid_age & people.alive
-        return active
+        # Exclude people who are not alive; operate on the values directly and combine in place to avoid creating intermediate Arr copies
+        active = np.greater(people.age.values, self.debut.values)
+        active &= self.participant.values
+        active &= people.alive.values
+        return self.participant.asnew(active)
 
-    def available(self, people, sex):
+    def available(self, people, sex, active=None):
         # Currently assumes unpartnered people are available
         # Could modify this to account for concurrency
         # This property could also be overwritten by a NetworkConnector
         # which could incorporate information about membership in other
         # contact networks
-        available = people[sex] & self.active(people)
+        # If the output of self.active(people) has already been computed this timestep, it can be passed in to avoid recomputing it
+        if active is None:
+            active = self.active(people)
+        available = people[sex] & active
         available[self.edges.p1] = False
         available[self.edges.p2] = False
         return available.uids
 
     def net_beta(self, disease_beta=None, inds=None, disease=None):
         if inds is None: inds = Ellipsis
-        return self.edges.beta[inds] * (1 - (1 - disease_beta) ** (self.edges.acts[inds] * self.t.dt))
+        edges = self.edges
+
+        # Equivalent to beta*(1 - (1 - disease_beta)**(acts*dt)), but reusing a single temporary array
+        p_edge = np.multiply(edges.acts[inds], self.t.dt, dtype=np.float64) # Acts and dt may both be integers
+        np.power(1 - disease_beta, p_edge, out=p_edge)
+        np.subtract(1, p_edge, out=p_edge)
+        p_edge *= edges.beta[inds]
+        return p_edge
 
 
 # %% Specific instances of networks
@@ -470,13 +542,11 @@ class StaticNet(Network):
             raise ValueError(errmsg)
 
     def get_edges(self):
-        p1s = []
-        p2s = []
-        for edge in self.graph.edges():
-            p1, p2 = edge
-            p1s.append(p1)
-            p2s.append(p2)
-        edges = dict(p1=p1s, p2=p2s, beta=np.ones_like(p1s))
+        n_edges = self.graph.number_of_edges()
+        flat = np.fromiter(itertools.chain.from_iterable(self.graph.edges()), dtype=ss_int_, count=2*n_edges) # Unpack the (p1, p2) tuples in one pass rather than looping in Python
+        p1 = flat[0::2]
+        p2 = flat[1::2]
+        edges = dict(p1=p1, p2=p2, beta=np.ones(len(p1), dtype=ss_float_))
         self.append(edges)
         return
 
@@ -602,7 +672,7 @@ class ErdosRenyiNet(DynamicNetwork):
         ints = self.randint.rvs(born_uids)
 
         # All possible edges are upper triangle of complete matrix
-        idx1, idx2 = np.triu_indices(n=len(born_uids), k=1)
+        idx1, idx2 = self.triu_pairs(len(born_uids))
 
         # Use integers to create random numbers per edge
         i1 = ints[idx1]
@@ -655,40 +725,60 @@ class DiskNet(Network):
         return
 
     def step(self):
+        # Gather the positions of active agents once, and update them as plain arrays
+        uids = self.sim.people.auids
+        x = self.x.raw[uids]
+        y = self.y.raw[uids]
+        theta = self.theta.raw[uids]
+
         # Motion step
         vdt = self.pars.v * self.t.dt
-        self.x[:] = self.x + vdt * np.cos(self.theta)
-        self.y[:] = self.y + vdt * np.sin(self.theta)
+        x += vdt * np.cos(theta)
+        y += vdt * np.sin(theta)
 
-        # Wall bounce
+        # Wall bounce, one edge at a time as each reflection can move an agent past the opposite edge
 
         ## Right edge
-        inds = (self.x > 1).uids
-        self.x[inds] = 2 - self.x[inds]
-        self.theta[inds] = np.pi - self.theta[inds]
+        hit = x > 1
+        x = np.where(hit, 2 - x, x)
+        theta = np.where(hit, np.pi - theta, theta)
 
         ## Left edge
-        inds = (self.x < 0).uids
-        self.x[inds] =  -self.x[inds]
-        self.theta[inds] = np.pi - self.theta[inds]
+        hit = x < 0
+        x = np.where(hit, -x, x)
+        theta = np.where(hit, np.pi - theta, theta)
 
         ## Top edge
-        inds = (self.y > 1).uids
-        self.y[inds] = 2 - self.y[inds]
-        self.theta[inds] = - self.theta[inds]
+        hit = y > 1
+        y = np.where(hit, 2 - y, y)
+        theta = np.where(hit, -theta, theta)
 
         ## Bottom edge
-        inds = (self.y < 0).uids
-        self.y[inds] = -self.y[inds]
-        self.theta[inds] = - self.theta[inds]
+        hit = y < 0
+        y = np.where(hit, -y, y)
+        theta = np.where(hit, -theta, theta)
+
+        self.x.raw[uids] = x
+        self.y.raw[uids] = y
+        self.theta.raw[uids] = theta
 
         self.add_pairs()
         return
 
     def add_pairs(self):
         """ Generate contacts """
-        p1, p2 = np.triu_indices(n=len(self.x), k=1)
-        d12_sq = (self.x.raw[p2]-self.x.raw[p1])**2 + (self.y.raw[p2]-self.y.raw[p1])**2
+        p1, p2 = self.triu_pairs(len(self.x))
+        x = self.x.raw
+        y = self.y.raw
+
+        # Squared distance for every pair, computed in place to limit the number of pair-sized temporaries
+        d12_sq = x[p2]
+        d12_sq -= x[p1]
+        d12_sq *= d12_sq
+        dy = y[p2]
+        dy -= y[p1]
+        dy *= dy
+        d12_sq += dy
         edge = d12_sq < self.pars.r**2
 
         self.edges['p1'] = ss.uids(p1[edge])
@@ -768,30 +858,35 @@ class MFNet(SexualNetwork):
 
     def set_network_states(self, upper_age=None):
         """ Set network states including age of entry into network and participation rates """
-        self.set_debut(upper_age=upper_age)
-        self.set_participation(upper_age=upper_age)
+        uids = self.get_uids(upper_age) # Find the agents once, rather than once per state
+        self.set_debut(uids=uids)
+        self.set_participation(uids=uids)
         return
 
-    def set_participation(self, upper_age=None):
-        """ Set people who will participate in the network at some point """
+    def get_uids(self, upper_age=None):
+        """ Agents whose network states need to be set: everyone, or only those younger than upper_age """
         people = self.sim.people
         if upper_age is None: uids = people.auids
         else: uids = (people.age < upper_age).uids
+        return uids
+
+    def set_participation(self, upper_age=None, uids=None):
+        """ Set people who will participate in the network at some point """
+        if uids is None: uids = self.get_uids(upper_age)
         self.participant[uids] = self.pars.participation.rvs(uids)
         return
 
-    def set_debut(self, upper_age=None):
+    def set_debut(self, upper_age=None, uids=None):
         """ Set debut age """
-        people = self.sim.people
-        if upper_age is None: uids = people.auids
-        else: uids = (people.age < upper_age).uids
+        if uids is None: uids = self.get_uids(upper_age)
         self.debut[uids] = self.pars.debut.rvs(uids)
         return
 
     def add_pairs(self):
         people = self.sim.people
-        available_m = self.available(people, 'male')
-        available_f = self.available(people, 'female')
+        active = self.active(people) # Shared by both sexes
+        available_m = self.available(people, 'male', active)
+        available_f = self.available(people, 'female', active)
 
         # random.choice is not common-random-number safe, and therefore we do
         # not try to Stream-ify the following draws at this time.
@@ -805,10 +900,12 @@ class MFNet(SexualNetwork):
             p1 = self.dist.rvs(n=len(p2))
         self.dist.jump() # TODO: think if there's a better way
 
-        beta = np.ones_like(p1)
+        beta = np.ones(len(p1), dtype=ss_float_) # Match the dtype of the beta column, so appending doesn't upcast it
 
-        # Figure out durations and acts
-        if (len(p1) == len(np.unique(p1))):
+        # Figure out durations and acts. The available males are unique by construction, as is any sample
+        # drawn from them without replacement, so only fall back to checking with np.unique() otherwise.
+        p1_unique = (p1 is available_m) or not self.dist.pars.get('replace', True)
+        if p1_unique or (len(p1) == len(np.unique(p1))):
             # No duplicates and user has enabled multirng, so use slotting based on p1
             dur_vals = self.pars.duration.rvs(p1)
             act_vals = self.pars.acts.rvs(p1)
@@ -874,16 +971,11 @@ class MSMNet(SexualNetwork):
         p1 = available_m[:n_pairs]
         p2 = available_m[n_pairs:n_pairs*2]
 
-        # Figure out durations
-        if (len(p1) == len(np.unique(p1))):
-            # No duplicates, so use slotting based on p1
-            dur = self.pars.duration.rvs(p1)
-            act_vals = self.pars.acts.rvs(p1)
-        else:
-            dur = self.pars.duration.rvs(len(p1)) # Just use len(p1) to say how many draws are needed
-            act_vals = self.pars.acts.rvs(len(p1))
+        # Figure out durations; p1 is a slice of the (unique) available males, so there are no duplicates and slotting based on p1 can be used
+        dur = self.pars.duration.rvs(p1)
+        act_vals = self.pars.acts.rvs(p1)
 
-        self.append(p1=p1, p2=p2, beta=np.ones_like(p1), dur=dur, acts=act_vals)
+        self.append(p1=p1, p2=p2, beta=np.ones(len(p1), dtype=ss_float_), dur=dur, acts=act_vals)
 
         return len(p1)
 
@@ -923,8 +1015,9 @@ class EmbeddingNet(MFNet):
 
     def add_pairs(self):
         people = self.sim.people
-        available_m = self.available(people, 'male')
-        available_f = self.available(people, 'female')
+        active = self.active(people) # Shared by both sexes
+        available_m = self.available(people, 'male', active)
+        available_f = self.available(people, 'female', active)
 
         if not len(available_m) or not len(available_f):
             if ss.options.verbose > 1:
@@ -933,23 +1026,70 @@ class EmbeddingNet(MFNet):
 
         available = ss.uids.cat(available_m, available_f)
         loc = self.pars.embedding_func.rvs(available)
-        loc_f = loc[people.female[available]]
-        loc_m = loc[~people.female[available]]
-
-        dist_mat = spsp.distance_matrix(loc_m[:, np.newaxis], loc_f[:, np.newaxis])
-        ind_m, ind_f = spo.linear_sum_assignment(dist_mat)
+        n_m = len(available_m) # Males come first, so split by position rather than looking up (and inverting) people.female
+        loc_m = loc[:n_m]
+        loc_f = loc[n_m:]
+
+        # In 1D, there is always an optimal assignment in which pairs don't cross, so match in sorted order
+        order_m = np.argsort(loc_m, kind='stable')
+        order_f = np.argsort(loc_f, kind='stable')
+        if len(loc_m) == len(loc_f): # Pairing by rank is then optimal
+            ind_m = order_m
+            ind_f = order_f
+        elif len(loc_m) < len(loc_f): # Otherwise, choose which members of the larger group to leave unpaired
+            im, jf = self.match_sorted(loc_m[order_m], loc_f[order_f])
+            ind_m = order_m[im]
+            ind_f = order_f[jf]
+        else:
+            jf, im = self.match_sorted(loc_f[order_f], loc_m[order_m])
+            ind_m = order_m[im]
+            ind_f = order_f[jf]
         n_pairs = len(ind_f)
 
         # Finalize pairs
         p1 = available_m[ind_m]
         p2 = available_f[ind_f]
-        beta = np.ones(n_pairs) # TODO: Allow custom beta
+        beta = np.ones(n_pairs, dtype=ss_float_) # TODO: Allow custom beta
         dur_vals = self.pars.duration.rvs(p1)
         act_vals = self.pars.acts.rvs(p1)
 
         self.append(p1=p1, p2=p2, beta=beta, dur=dur_vals, acts=act_vals)
         return len(beta)
 
+    @staticmethod
+    @nb.njit(cache=True)
+    def match_sorted(a, b):
+        """
+        Match each element of the sorted array a to a distinct element of the sorted array b, where
+        len(a) <= len(b), minimizing the total distance. Since matches never cross, the dynamic program
+        only needs to track how many elements of b have been skipped, i.e. O(len(a)*(len(b)-len(a)+1)).
+        """
+        m = len(a)
+        w = len(b) - m + 1 # Number of possible skips, plus one
+        cost = np.zeros(w)
+        take = np.zeros((m, w), dtype=np.bool_) # Whether a[i] is matched to b[i+k] in the optimal solution so far
+        for i in range(m):
+            for k in range(w):
+                c = cost[k] + abs(a[i] - b[i+k]) # Match a[i] to b[i+k], having skipped k elements of b
+                if k == 0 or c <= cost[k-1]:
+                    cost[k] = c
+                    take[i,k] = True
+                else: # Skip b[i+k] instead
+                    cost[k] = cost[k-1]
+
+        # Trace back the matches
+        ia = np.arange(m)
+        ib = np.empty(m, dtype=np.int64)
+        i = m - 1
+        k = w - 1
+        while i >= 0:
+            if take[i,k]:
+                ib[i] = i + k
+                i -= 1
+            else:
+                k -= 1
+        return ia, ib
+
 
 class MaternalNet(DynamicNetwork):
     """
@@ -980,8 +1120,7 @@ class MaternalNet(DynamicNetwork):
         people = self.sim.people
         edges = self.edges
         active = (edges.end > self.ti) & people.alive[edges.p1] & people.alive[edges.p2]
-        for k in self.meta_keys():
-            edges[k] = edges[k][active]
+        self.keep_edges(active)
         return len(active)
 
     def add_pairs(self, mother_inds=None, unborn_inds=None, dur=None, start=None):
@@ -239,21 +239,31 @@ class People(sc.prettyobj):
     def __getitem__(self, key):
         """
         Allow people['attr'] instead of getattr(people, 'attr')
-        If the key is an integer, alias `people.person()` to return a `Person` instance
+        If the key is an integer, alias `people.person()` to return a `Person` instance.
+        Module states can be accessed by their combined name, e.g. people['sir.infected']
         """
         if isinstance(key, int):
             return self.person(key)
+        state = dict.get(self.states, key) # Fast path: registered states (base states under their plain names, module states under their combined names)
+        if state is not None:
+            return state
         else:
             return getattr(self, key)
 
     def __setitem__(self, key, value):
-        """ Ditto """
+        """ Ditto; for registered states, the values of the active agents are updated in place """
+        state = dict.get(self.states, key)
+        if state is not None:
+            state[:] = value # Write into the existing state, so it stays registered (and matches __getitem__)
+            return
         return setattr(self, key, value)
 
     def __iter__(self):
-        """ Iterate over people """
+        """ Iterate over people; for anything performance-sensitive, operate on the states directly instead """
+        raws = {key:self[key].raw for key in ['uid', 'slot']} # Look up each state once, rather than once per person as in person()
+        raws.update({key:state.raw for key,state in self.states.items()})
         for i in range(len(self)):
-            yield self[i]
+            yield Person({key:raw[i] for key,raw in raws.items()})
 
     def __setstate__(self, state):
         """
@@ -272,7 +282,13 @@ class People(sc.prettyobj):
         """
         Return the scaled versions of the flows -- replacement for len(inds)
         followed by scale factor multiplication
+
+        Args:
+            inds (uids/BoolArr): the agents to count; if a BoolArr (e.g. ``people.alive``), the weighted count is
+            computed directly as a dot product, without first converting it to UIDs
         """
+        if isinstance(inds, ss.BoolArr):
+            return self.scale.values @ inds.values
         return self.scale[inds].sum()
 
     def update_post(self):
@@ -317,7 +333,7 @@ class People(sc.prettyobj):
 
         # Execute deaths that took place this timestep (i.e., changing the `alive` state of the agents). This is executed
         # before analyzers have run so that analyzers are able to inspect and record outcomes for agents that died this timestep
-        for disease in self.sim.diseases():
+        for disease in self.sim.diseases.dict_values(): # Called every timestep, so iterate without building a list
             if isinstance(disease, ss.Disease):
                 disease.step_die(death_uids)
 
@@ -354,7 +370,7 @@ class People(sc.prettyobj):
         res = self.sim.results
         res.n_alive[ti] = np.count_nonzero(self.alive)
         res.new_deaths[ti] = np.count_nonzero(self.ti_dead == ti)
-        res.cum_deaths[ti] = np.sum(res.new_deaths[:ti]) # TODO: inefficient to compute the cumulative sum on every timestep!
+        res.cum_deaths[ti] = res.cum_deaths[ti-1] + res.new_deaths[ti-1] if ti else 0 # Running total, equivalent to np.sum(res.new_deaths[:ti])
         return
 
     def finish_step(self):
@@ -372,6 +388,18 @@ class People(sc.prettyobj):
             person[key] = self.states[key][ind]
         return person
 
+    def to_df(self):
+        """
+        Export the active agents to a dataframe, with one row per agent and one
+        column per state. Each column is gathered in a single operation and
+        keeps the dtype of the underlying state.
+        """
+        cols = {'uid': self.auids, 'slot': self.slot.values}
+        for key, state in self.states.items():
+            cols[key] = state.values
+        df = sc.dataframe(cols)
+        return df
+
 
 class Person(sc.objdict):
     """ A simple class to hold all attributes of a person """
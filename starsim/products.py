@@ -26,6 +26,7 @@ class Dx(Product):
     """
     Generic class for diagnostics
     """
+    probs = None # Result probabilities for each (disease, state) pair, calculated from the dataframe by update_probs()
 
     def __init__(self, df, hierarchy=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -43,6 +44,25 @@ class Dx(Product):
         self.result_dist = ss.choice(a=n_results)
         return
 
+    def init_pre(self, sim):
+        super().init_pre(sim)
+        self.update_probs()
+        return
+
+    def update_probs(self):
+        """
+        Calculate the probability of each result for each disease and state from the dataframe
+
+        This is done when the product is initialized; call it again if the dataframe is changed after that.
+        """
+        self.probs = {}
+        for disease in self.diseases:
+            for state in self.health_states:
+                df_filter = (self.df.state == state) & (self.df.disease == disease)
+                thisdf = self.df[df_filter]  # apply filter to get the results for this state & genotype
+                self.probs[(disease, state)] = [thisdf[thisdf.result == result].probability.values[0] for result in self.hierarchy]
+        return self.probs
+
     @property
     def default_value(self):
         return len(self.hierarchy) - 1
@@ -58,28 +78,30 @@ class Dx(Product):
         """
 
         # Pre-fill with the default value, which is set to be the last value in the hierarchy
-        results = pd.Series(self.default_value,index=uids)
+        results = np.full(len(uids), self.default_value)
+        if self.probs is None: # E.g. if the product was never initialized
+            self.update_probs()
 
         for disease in self.diseases:
             for state in self.health_states:
                 this_state = getattr(self.sim.diseases[disease], state)
                 true_uids = this_state.uids # Find people for which this state is true
-                these_uids = true_uids.intersect(uids) # Find intersection of people in this state and the supplied UIDs
+                in_state = np.isin(uids, true_uids) # Find people in this state among the supplied UIDs
+                these_uids = uids[in_state]
 
-                # Filter the dataframe to extract test results for people in this state
-                df_filter = (self.df.state == state) & (self.df.disease == disease)
-                thisdf = self.df[df_filter]  # apply filter to get the results for this state & genotype
-                probs = [thisdf[thisdf.result == result].probability.values[0] for result in self.hierarchy]
+                # Extract test results for people in this state
+                probs = self.probs[(disease, state)]
                 self.result_dist.pars['p'] = probs  # Overwrite distribution probabilities
 
                 # Sort people into one of the possible result states and then update their overall results
                 this_result = self.result_dist.rvs(these_uids)
-                results.loc[these_uids] = np.minimum(this_result, results.loc[these_uids])
+                results[in_state] = np.minimum(this_result, results[in_state])
 
+        # Only construct the series once, rather than updating it by label on every iteration
         if return_format == 'dict':
-            return {k: ss.uids(results.index[results == i]) for i, k in enumerate(self.hierarchy)}
+            return {k: ss.uids(uids[results == i]) for i, k in enumerate(self.hierarchy)}
         elif return_format == 'array':
-            return results
+            return pd.Series(results, index=uids)
         else:
             raise Exception('Unknown return format')
 
@@ -250,10 +250,10 @@ class MultiSim:
 
         rflat = reduced_sim.results.flatten()
         rkeys = list(rflat.keys())
+        flats = [sim.results.flatten() for sim in self.sims] # Flatten each sim once, rather than once per result
         for rkey in rkeys:
             raw[rkey] = np.zeros((len(reduced_sim), len(self.sims)))
-            for s, sim in enumerate(self.sims):
-                flat = sim.results.flatten()
+            for s, flat in enumerate(flats):
                 raw[rkey][:, s] = flat[rkey]
 
         for rkey in rkeys:
@@ -457,13 +457,14 @@ class Sim(ss.Base):
         df = self.results.to_df(sep=sep, descend=True)
         return df
 
-    def save(self, filename=None, shrink=None, **kwargs):
+    def save(self, filename=None, shrink=None, compression='gzip', **kwargs):
         """
-        Save to disk as a gzipped pickle.
+        Save to disk as a compressed pickle.
 
         Args:
             filename (str or None): the name or path of the file to save to; if None, uses stored
             shrink (bool or None): whether to shrink the sim prior to saving (reduces size by ~99%)
+            compression (str): passed to sc.save(); 'zstd' is several times faster than the default 'gzip' for the mostly numeric data in a sim, but older readers may not be able to open it
             kwargs: passed to sc.makefilepath()
 
         Returns:
@@ -485,12 +486,12 @@ class Sim(ss.Base):
 
         # Handle the shrinkage and save
         sim = self.shrink(inplace=False) if shrink else self
-        sc.save(filename=filename, obj=sim)
+        sc.save(filename=filename, obj=sim, compression=compression, protocol=5) # Protocol 5 pickles NumPy arrays without an intermediate copy of their data
         return filename
 
     @staticmethod
     def load(filename, *args, **kwargs):
-        """ Load from disk from a gzipped pickle """
+        """ Load from disk from a compressed pickle (any compression supported by sc.load()) """
         sim = sc.load(filename, *args, **kwargs)
         if not isinstance(sim, Sim):  # pragma: no cover
             errormsg = f'Cannot load object of {type(sim)} as a Sim object'
@@ -175,16 +175,26 @@ def find_contacts(p1, p2, inds):  # pragma: no cover
     add extra people. For a version with sorting by default, see Network.find_contacts(). Indices must be
     an int64 array since this is what's returned by true() etc. functions by default.
     """
-    pairing_partners = set()
-    inds = set(inds)
-    for i in range(len(p1)):
-        if p1[i] in inds:
-            pairing_partners.add(p2[i])
-        if p2[i] in inds:
-            pairing_partners.add(p1[i])
+    pairing_partners = set(find_contacts_numba(p1, p2, inds))
     return pairing_partners
 
 
+@nb.njit(cache=True) # Defined at the module level so it is only compiled (or loaded from the cache) once per process
+def find_contacts_numba(p1, p2, inds):
+    """ Scan both sides of the edge list for the target indices; see find_contacts() """
+    targets = set(inds)
+    partners = set()
+    for i in range(len(p1)):
+        if p1[i] in targets:
+            partners.add(p2[i])
+        if p2[i] in targets:
+            partners.add(p1[i])
+    out = np.empty(len(partners), dtype=p1.dtype)
+    for j, partner in enumerate(partners):
+        out[j] = partner
+    return out
+
+
 def check_requires(sim, requires, *args):
     """ Check that the module's requirements (of other modules) are met """
     errs = sc.autolist()
@@ -199,6 +209,12 @@ def check_requires(sim, requires, *args):
     return
 
 
+@nb.njit(cache=True) # Defined at the module level so it is only compiled (or loaded from the cache) once per process
+def set_seed_numba(seed):
+    """ Reset the seed of Numba's random number generator; see set_seed() """
+    return np.random.seed(seed)
+
+
 def set_seed(seed=None):
     '''
     Reset the random seed -- complicated because of Numba, which requires special
@@ -209,10 +225,6 @@ def set_seed(seed=None):
         seed (int): the random seed
     '''
 
-    @nb.njit(cache=True)
-    def set_seed_numba(seed):
-        return np.random.seed(seed)
-
     def set_seed_regular(seed):
         return np.random.seed(seed)
 
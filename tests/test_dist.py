@@ -47,6 +47,11 @@ def test_dist(m=m):
     # Test other options
     dist.show_state()
     dist.plot_hist()
+
+    # Test lower-precision draws
+    rvs32 = ss.normal(dtype=np.float32, strict=False).init()(m)
+    assert rvs32.dtype == np.float32, 'Normal draws should use the requested dtype'
+    assert np.all(ss.normal(loc=2, scale=0, strict=False).init()(m) == 2), 'Normal with zero scale should be constant'
     return rvs
 
 
@@ -105,6 +110,16 @@ def test_dists(n=n, do_plot=False):
     assert np.all(testvals[0,:] == testvals[1,:]), 'Newly initialized objects should match'
     assert np.all(testvals[:,0] != testvals[:,1]), 'After jumping, values should be different'
 
+    # Jumping advances the RNG in place, but should end up in the same state as NumPy's jumped()
+    dist = ss.random(strict=False)
+    expected = np.random.default_rng(dist.seed).bit_generator.jumped(jumps=5).state
+    dist(n)
+    dist.jump(to=5)
+    assert dist.state == expected, 'Jumping should match the state from PCG64.jumped()'
+    dist.jump(to=6, lazy=True) # Deferred until the RNG is used, e.g. by accessing the state
+    expected = np.random.default_rng(dist.seed).bit_generator.jumped(jumps=6).state
+    assert dist.state == expected, 'A lazy jump should give the same state once applied'
+
     if do_plot:
         plot_rvs(rvs)
 
@@ -158,6 +173,12 @@ def test_exceptions(m=m):
     assert np.array_equal(rvs, rvs2[0]), 'Separate dists should match'
     assert not np.array_equal(rvs2[0], rvs2[1]), 'Multiple calls to the same dist should not match'
 
+    # Check that invalid parameters are caught
+    for scale in [-1, np.array([1, -1]), [1, -1]]:
+        with pytest.raises(ValueError):
+            ss.normal(scale=scale, strict=False).init(trace='test').rvs(2)
+    assert len(ss.normal(scale=[1, 2], strict=False).init(trace='test').rvs(2)) == 2, 'List-valued scales should be valid'
+
     return dist, dist2
 
 
@@ -180,6 +201,15 @@ def test_reset(m=m):
     dist.reset(0)
     r4 = dist.rvs(m)
     assert all(r4 == r1)
+    assert len(dist.history) == 2, 'Only the initial and most recent states should be stored'
+
+    # Distributions pickled before the RNG became a property can still be loaded
+    old = sc.dcp(dist)
+    old.__dict__['rng'] = old.__dict__.pop('_rng')
+    del old.__dict__['_jump_to']
+    new = sc.loadstr(sc.dumpstr(old))
+    new.reset(0)
+    assert np.array_equal(new.rvs(m), r1), 'Old pickles should load with the same random numbers'
 
     for r in [r1, r2, r3, r4]:
         print(r)
@@ -238,9 +268,35 @@ def test_array(n=n):
     draws = d.rvs(uids)
     print(f'Uniform sample for uids {uids} returned {draws}')
 
+    # The PPF must not modify its input
+    rands = np.array([0.1, 0.5])
+    d.ppf(rands)
+    assert np.array_equal(rands, [0.1, 0.5]), 'ppf() should not modify its input'
+
     assert len(draws) == len(uids)
     for i in range(len(uids)):
         assert low[i] < draws[i] < low[i] + high[i], 'Invalid value'
+
+    # Integers are drawn the same way, but keep their dtype
+    d = ss.randint(low=low, high=high, strict=False).init(slots=np.arange(uids.max()+1))
+    ints = d.rvs(uids)
+    assert ints.dtype == ss.dtypes.rand_int
+    assert np.all((low <= ints) & (ints <= high)), 'Invalid value'
+
+    # The PPF must not modify its input
+    rands = np.array([0.1, 0.5])
+    d.ppf(rands)
+    assert np.array_equal(rands, [0.1, 0.5]), 'ppf() should not modify its input'
+
+    # Choice probabilities can be modified in place
+    c = ss.choice(a=3, p=np.array([1.0, 0, 0]), strict=False).init(trace='choice')
+    assert np.all(c.rvs(10) == 0)
+    c.pars.p[:] = [0, 0, 1.0]
+    assert np.all(c.rvs(10) == 2), 'Changes to p should be used'
+
+    # Choices without replacement are unique
+    c = ss.choice(a=5, p=[0.2]*5, replace=False, strict=False).init(trace='choice')
+    assert len(np.unique(c.rvs(5))) == 5, 'Choices without replacement should be unique'
     return draws
 
 
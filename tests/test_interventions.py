@@ -5,6 +5,7 @@ Run tests of vaccines
 # %% Imports and settings
 import sciris as sc
 import numpy as np
+import pandas as pd
 import starsim as ss
 
 
@@ -97,11 +98,86 @@ def test_sir_vaccine_all_or_nothing(do_plot=False):
     return run_sir_vaccine(0.3, True, do_plot=do_plot)
 
 
+def test_dx():
+    sc.heading('Testing diagnostics')
+
+    # A perfect test: infected people test positive, and susceptible people test negative
+    df = pd.DataFrame(dict(
+        disease     = ['sis']*4,
+        state       = ['infected', 'infected', 'susceptible', 'susceptible'],
+        result      = ['positive', 'negative', 'positive', 'negative'],
+        probability = [1.0, 0.0, 0.0, 1.0],
+    ))
+    screen = ss.routine_screening(product=ss.Dx(df), prob=0) # Only used to add the product to the sim
+    sim = ss.Sim(n_agents=1000, diseases=dict(type='sis', init_prev=0.2), networks='random', interventions=screen)
+    sim.init(verbose=False)
+    dx = sim.interventions[0].product # The sim's copy
+    uids = sim.people.auids
+    infected = sim.diseases.sis.infected
+
+    # Check both return formats
+    res = dx.administer(uids)
+    assert np.array_equal(res['positive'], infected.uids), 'Infected people should test positive'
+    assert np.array_equal(res['negative'], (~infected).uids), 'Susceptible people should test negative'
+    arr = dx.administer(uids, return_format='array')
+    assert np.array_equal(arr.index, uids)
+    assert np.array_equal(arr.values == 0, infected[uids]), 'Array results should match the dict results'
+
+    # Changes to the dataframe are used after updating the probabilities
+    dx.df['probability'] = [0.0, 1.0, 0.0, 1.0] # Now a useless test
+    dx.update_probs()
+    res = dx.administer(uids)
+    assert len(res['positive']) == 0, 'Nobody should test positive after updating the dataframe'
+
+    return dx
+
+
+def test_treat_num():
+    sc.heading('Testing treatment queues')
+
+    class Record(ss.Product):
+        """ Record who was treated, without changing anything """
+        def __init__(self):
+            super().__init__()
+            self.treated = []
+
+        def administer(self, uids):
+            self.treated.append(uids)
+            return dict(successful=uids, unsuccessful=ss.uids())
+
+    # The eligible agents are set manually, in order of arrival
+    eligible = dict(uids=ss.uids())
+    def eligibility(sim):
+        return eligible['uids']
+
+    tn = ss.treat_num(product=Record(), prob=1.0, eligibility=eligibility, max_capacity=3)
+    sim = ss.Sim(n_agents=100, diseases='sis', networks='random', interventions=tn)
+    sim.init(verbose=False)
+    tn = sim.interventions[0]
+    treated = tn.product.treated
+
+    # More agents arrive than can be treated: the first to arrive are treated, and the rest wait
+    eligible['uids'] = ss.uids([5, 2, 8, 1, 9])
+    tn.step()
+    assert np.array_equal(treated[-1], [2, 5, 8]), 'The first agents to arrive should be treated first'
+    assert np.array_equal(tn.queue, [1, 9]), 'Agents beyond capacity should stay in the queue, in order'
+
+    # Those still waiting are treated before new arrivals, and treated agents leave the queue
+    eligible['uids'] = ss.uids([7, 3, 1, 9])
+    tn.step()
+    assert np.array_equal(treated[-1], [1, 7, 9]), 'Agents already waiting should be treated first'
+    assert np.array_equal(tn.queue, [3]), 'Treated agents should be removed from the queue'
+
+    return tn
+
+
 if __name__ == '__main__':
     T = sc.timer()
     do_plot = True
 
     leaky  = test_sir_vaccine_leaky(do_plot=do_plot)
     a_or_n = test_sir_vaccine_all_or_nothing(do_plot=do_plot)
+    dx     = test_dx()
+    tn     = test_treat_num()
 
     T.toc()
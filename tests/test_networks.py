@@ -191,6 +191,30 @@ def test_null():
     return sim
 
 
+def test_embedding():
+    sc.heading('Testing EmbeddingNet...')
+    import scipy.optimize as spo
+
+    # Matching sorted locations should be as good as solving the full assignment problem
+    np.random.seed(1)
+    for m, n in [(5, 5), (5, 12), (30, 31)]:
+        a = np.sort(np.random.randn(m))
+        b = np.sort(np.random.randn(n))
+        ia, ib = ss.EmbeddingNet.match_sorted(a, b)
+        dist = np.abs(a[:, None] - b[None, :])
+        ra, rb = spo.linear_sum_assignment(dist)
+        assert len(np.unique(ib)) == m, 'Each element should be matched at most once'
+        assert np.isclose(dist[ia, ib].sum(), dist[ra, rb].sum()), 'Sorted matching should be optimal'
+
+    # Pairs should be between available men and women
+    sim = ss.Sim(n_agents=medium, diseases='sis', networks='embedding', dur=5)
+    sim.run()
+    edges = sim.networks.embeddingnet.edges
+    assert len(edges.p1) > 0
+    assert not sim.people.female[edges.p1].any() and sim.people.female[edges.p2].all()
+    return sim
+
+
 def test_other():
     sc.heading('Other network tests...')
 
@@ -224,6 +248,7 @@ if __name__ == '__main__':
     erdo = test_erdosrenyi()
     disk = test_disk()
     null = test_null()
+    emb  = test_embedding()
     oth  = test_other()
 
     T.toc()
\ No newline at end of file
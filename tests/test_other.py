@@ -33,6 +33,27 @@ def test_people():
     # Possible to add a module to people outside a sim (not typical workflow)
     ppl.add_module(ss.HIV())
 
+    # Module states can be accessed by their combined name
+    assert ppl['hiv.infected'] is ppl.hiv.infected is ppl.states['hiv.infected']
+
+    # Exporting to a dataframe keeps one row per agent and the state dtypes
+    sim_ppl = ss.Sim(n_agents=small, diseases='sir', networks='random').init().people
+    df = sim_ppl.to_df()
+    assert len(df) == small
+    assert df['sir.infected'].dtype == bool
+
+    # Assigning to a state by name updates its values, rather than replacing it
+    sim_ppl['sir.infected'] = np.ones(small, dtype=bool)
+    assert sim_ppl['sir.infected'] is sim_ppl.states['sir.infected'] and sim_ppl.sir.infected.all()
+
+    # Scaled counts are the same whether the agents are given as a BoolArr or as UIDs
+    sim_ppl.scale[:] = np.random.rand(small)
+    sim_ppl['sir.infected'] = np.arange(small) % 3 == 0
+    infected = sim_ppl.sir.infected
+    expected = np.sum(sim_ppl.scale[infected.uids])
+    assert np.isclose(sim_ppl.scale_flows(infected), expected)
+    assert np.isclose(sim_ppl.scale_flows(infected.uids), expected)
+
     return ppl
 
 
@@ -176,6 +197,7 @@ def test_results():
 def test_check_reqiures():
     sc.heading('Testing check_requires')
     s1 = ss.Sim(diseases='sis', networks='random', n_agents=medium).init()
+    assert s1.diseases()[0] is s1.diseases.sis # Calling an ndict returns an indexable list
     ss.check_requires(s1, 'sis')
     ss.check_requires(s1, ss.SIS)
     with pytest.raises(AttributeError):
@@ -183,6 +205,22 @@ def test_check_reqiures():
     return s1
 
 
+def test_module_create():
+    sc.heading('Testing creating modules by name')
+    sir = ss.Disease.create('sir', beta=0.2)
+    assert isinstance(sir, ss.SIR)
+    assert isinstance(ss.Module.create('randomnet'), ss.RandomNet)
+    with pytest.raises(KeyError):
+        ss.Disease.create('randomnet') # Exists, but is not a disease
+
+    # A user class with the same name as a built-in one doesn't replace it
+    class SIR(ss.Intervention):
+        pass
+    assert type(ss.Module.create('sir')) is ss.SIR
+    assert type(ss.Intervention.create('sir')) is SIR
+    return sir
+
+
 # %% Run as a script
 if __name__ == '__main__':
     do_plot = True
@@ -200,6 +238,7 @@ if __name__ == '__main__':
     sims3 = test_deepcopy_until()
     sim4 = test_results()
     sim5 = test_check_reqiures()
+    sir = test_module_create()
 
     sc.toc(T)
     plt.show()